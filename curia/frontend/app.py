@@ -2,15 +2,15 @@
 A Gradio-based chatbot interface for interacting with a RAG system.
 """
 
-import gradio as gr
-
-from curia.rag import VectorStore
+from curia.frontend.query_cache import QueryCache
 
 
 def chatbot(message, _):
     """
     Takes a user message and yields the streaming response from the RAG system.
 
+    Repeated messages are answered from the cache in a single chunk.
+
     Args:
         message (str): The user's input message.
         history (list): The chat history (unused in this function).
@@ -18,20 +18,36 @@ def chatbot(message, _):
     Yields:
         str: The streaming response from the RAG system.
     """
+    cached_response = cache.get(message)
+    if cached_response is not None:
+        yield cached_response
+        return
+
     streaming_response = vectors.query(message)
-    message = ""
+    response = ""
     for token in streaming_response.response_gen:
-        message += token
-        yield message
+        response += token
+        yield response
+    cache.set(message, response)
+
+
+cache = QueryCache()
+
+
+if __name__ == "__main__":
+    # Ingestion workers are spawned and re-import this script, so the heavy
+    # imports are kept out of their way.
+    import gradio as gr
 
+    from curia.rag import VectorStore
 
-vectors = VectorStore(restart_database=False, streaming=True)
+    vectors = VectorStore(restart_database=False, streaming=True)
 
-examples = ["What happens in case about Parfums Marcel Rochas, in detail?"]
+    examples = ["What happens in case about Parfums Marcel Rochas, in detail?"]
 
-iface = gr.ChatInterface(
-    fn=chatbot,
-    title="CURIA Chatbot",
-    examples=examples,
-)
-iface.launch()
+    iface = gr.ChatInterface(
+        fn=chatbot,
+        title="CURIA Chatbot",
+        examples=examples,
+    )
+    iface.launch()
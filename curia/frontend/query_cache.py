@@ -0,0 +1,73 @@
+"""
+A cache of chatbot responses shared by concurrent chatbot requests.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class QueryCache:
+    """A thread-safe LRU cache of chatbot responses with a time-to-live."""
+
+    def __init__(self, maxsize: int = 512, ttl: float = 300.0):
+        """Initialize the QueryCache.
+
+        Args:
+            maxsize (int): Maximum number of cached responses.
+            ttl (float): Seconds after which a cached response expires.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _key(message: str) -> str:
+        """Normalize a message so trivially different queries share a key."""
+        return " ".join(message.split()).casefold()
+
+    def get(self, message: str) -> str | None:
+        """Get the cached response to a message.
+
+        Args:
+            message (str): The user's input message.
+
+        Returns:
+            str | None: The cached response, or None if missing or expired.
+        """
+        key = self._key(message)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, response = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def set(self, message: str, response: str) -> None:
+        """Cache the response to a message, evicting the oldest if full.
+
+        Empty responses are not cached, so that a generation that produced
+        nothing is retried on the next request.
+
+        Args:
+            message (str): The user's input message.
+            response (str): The complete response from the RAG system.
+        """
+        if not response:
+            return
+        key = self._key(message)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        with self._lock:
+            self._entries.clear()
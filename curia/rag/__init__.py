@@ -1,3 +1,40 @@
-"""Import RAG classes."""
+"""Import RAG classes.
 
-from .vector_store import VectorStore
+Classes are imported on first access, so that importing a single module of
+the package, as ingestion worker processes do with `pdf_reader`, does not
+import the vector store and model backends as well.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .embeddings import BatchOllamaEmbedding, TEIEmbedding
+    from .pdf_reader import PDFReader
+    from .vector_store import VectorStore
+
+_MODULES = {
+    "BatchOllamaEmbedding": "embeddings",
+    "TEIEmbedding": "embeddings",
+    "PDFReader": "pdf_reader",
+    "VectorStore": "vector_store",
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name: str) -> Any:
+    """Import a RAG class from its module.
+
+    Args:
+        name (str): Name of the class.
+
+    Returns:
+        Any: The class.
+
+    Raises:
+        AttributeError: If the package has no such class.
+    """
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(f".{_MODULES[name]}", __name__), name)
@@ -0,0 +1,370 @@
+"""Embedding models used by the vector store.
+
+This module provides a `BatchOllamaEmbedding` class that sends whole batches
+of text to Ollama's `/api/embed` endpoint in a single request, instead of the
+one request per text issued by `OllamaEmbedding`, and a `TEIEmbedding` class
+for models served by Hugging Face Text Embeddings Inference (TEI).
+`create_embed_model` picks between them, or FastEmbed models run in-process
+with ONNX Runtime, from the configured model name.
+"""
+
+import logging
+from typing import Any, Optional, Union
+
+import httpx
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.bridge.pydantic import Field, PrivateAttr
+from llama_index.embeddings.fastembed import FastEmbedEmbedding
+from llama_index.embeddings.ollama import OllamaEmbedding
+from ollama import ResponseError
+
+DEFAULT_EMBED_BATCH_SIZE = 64
+DEFAULT_OLLAMA_BASE_URL = "http://localhost:11434"
+DEFAULT_TEI_TIMEOUT = 60.0
+
+
+class BatchOllamaEmbedding(OllamaEmbedding):
+    """Ollama embedding model that embeds batches in one HTTP request."""
+
+    keep_alive: Optional[Union[float, str]] = Field(
+        default=None,
+        description="How long Ollama keeps the model loaded after a request.",
+    )
+
+    @classmethod
+    def class_name(cls) -> str:
+        """Return the class name."""
+        return "BatchOllamaEmbedding"
+
+    def _get_query_embedding(self, query: str) -> list[float]:
+        """Get query embedding.
+
+        Queries go through `/api/embed` as well, so that query and document
+        vectors are produced (and normalized) by the same endpoint.
+        """
+        return self._get_text_embeddings([query])[0]
+
+    async def _aget_query_embedding(self, query: str) -> list[float]:
+        """Asynchronously get query embedding."""
+        return (await self._aget_text_embeddings([query]))[0]
+
+    def _get_text_embedding(self, text: str) -> list[float]:
+        """Get text embedding."""
+        return self._get_text_embeddings([text])[0]
+
+    async def _aget_text_embedding(self, text: str) -> list[float]:
+        """Asynchronously get text embedding."""
+        return (await self._aget_text_embeddings([text]))[0]
+
+    async def _aget_text_embeddings(
+        self, texts: list[str]
+    ) -> list[list[float]]:
+        """Asynchronously get text embeddings, halving the batch on errors.
+
+        Args:
+            texts (list[str]): Texts to embed.
+
+        Returns:
+            list[list[float]]: One embedding per text.
+
+        Raises:
+            ResponseError: If a single text still fails with a server error.
+            httpx.TimeoutException: If a single text still times out.
+        """
+        try:
+            return await self.aget_general_text_embeddings(texts)
+        except (ResponseError, httpx.TimeoutException) as error:
+            half = self._split_failed_batch(texts, error)
+            return await self._aget_text_embeddings(
+                texts[:half]
+            ) + await self._aget_text_embeddings(texts[half:])
+
+    def _get_text_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Get text embeddings, halving the batch on server errors.
+
+        Args:
+            texts (list[str]): Texts to embed.
+
+        Returns:
+            list[list[float]]: One embedding per text.
+
+        Raises:
+            ResponseError: If a single text still fails with a server error.
+            httpx.TimeoutException: If a single text still times out.
+        """
+        try:
+            return self.get_general_text_embeddings(texts)
+        except (ResponseError, httpx.TimeoutException) as error:
+            half = self._split_failed_batch(texts, error)
+            return self._get_text_embeddings(
+                texts[:half]
+            ) + self._get_text_embeddings(texts[half:])
+
+    @staticmethod
+    def _split_failed_batch(texts: list[str], error: Exception) -> int:
+        """Decide where to split a batch whose request failed.
+
+        Must be called from an `except` block, as errors that cannot be
+        helped by smaller batches are re-raised.
+
+        Args:
+            texts (list[str]): Texts of the failed batch.
+            error (Exception): Error raised by the request.
+
+        Returns:
+            int: Number of texts in the first half.
+        """
+        if len(texts) == 1 or (
+            isinstance(error, ResponseError) and error.status_code < 500
+        ):
+            raise error
+        logging.getLogger("BatchOllamaEmbedding").warning(
+            "Embedding batch of %d failed (%s), retrying in halves",
+            len(texts),
+            str(error),
+        )
+        return len(texts) // 2
+
+    def get_general_text_embeddings(
+        self, texts: list[str]
+    ) -> list[list[float]]:
+        """Get Ollama embeddings for a batch of texts in one request.
+
+        Args:
+            texts (list[str]): Texts to embed.
+
+        Returns:
+            list[list[float]]: One embedding per text.
+        """
+        result = self._client.embed(
+            model=self.model_name,
+            input=texts,
+            options=self.ollama_additional_kwargs,
+            keep_alive=self.keep_alive,
+        )
+        return list(result["embeddings"])
+
+    async def aget_general_text_embeddings(
+        self, texts: list[str]
+    ) -> list[list[float]]:
+        """Asynchronously get Ollama embeddings for a batch in one request.
+
+        Args:
+            texts (list[str]): Texts to embed.
+
+        Returns:
+            list[list[float]]: One embedding per text.
+        """
+        result = await self._async_client.embed(
+            model=self.model_name,
+            input=texts,
+            options=self.ollama_additional_kwargs,
+            keep_alive=self.keep_alive,
+        )
+        return list(result["embeddings"])
+
+
+class TEIEmbedding(BaseEmbedding):
+    """Embedding model served by a Text Embeddings Inference server."""
+
+    base_url: str = Field(description="Base url of the TEI server.")
+    timeout: float = Field(
+        default=DEFAULT_TEI_TIMEOUT,
+        description="Timeout of embedding requests in seconds.",
+    )
+
+    _client: httpx.Client = PrivateAttr()
+    _async_client: httpx.AsyncClient = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        """Create the HTTP clients of the TEI server."""
+        self._client = httpx.Client(
+            base_url=self.base_url, timeout=self.timeout
+        )
+        self._async_client = httpx.AsyncClient(
+            base_url=self.base_url, timeout=self.timeout
+        )
+
+    @classmethod
+    def class_name(cls) -> str:
+        """Return the class name."""
+        return "TEIEmbedding"
+
+    @classmethod
+    def from_server(
+        cls, base_url: str, embed_batch_size: int = DEFAULT_EMBED_BATCH_SIZE
+    ) -> "TEIEmbedding":
+        """Create a model for the one served at a TEI server.
+
+        The server's `/info` gives the ID of the served model, and the
+        largest batch it accepts in one request, which is 32 by default.
+
+        Args:
+            base_url (str): Base url of the TEI server.
+            embed_batch_size (int): Largest number of texts embedded per
+                request, lowered to the server's limit if needed.
+
+        Returns:
+            TEIEmbedding: Model for embedding text.
+
+        Raises:
+            httpx.HTTPError: If the server cannot be reached.
+        """
+        response = httpx.get(f"{base_url}/info", timeout=DEFAULT_TEI_TIMEOUT)
+        response.raise_for_status()
+        info = response.json()
+        return cls(
+            base_url=base_url,
+            model_name=info["model_id"],
+            embed_batch_size=min(
+                embed_batch_size, info["max_client_batch_size"]
+            ),
+        )
+
+    def _get_query_embedding(self, query: str) -> list[float]:
+        """Get query embedding."""
+        return self._get_text_embeddings([query])[0]
+
+    async def _aget_query_embedding(self, query: str) -> list[float]:
+        """Asynchronously get query embedding."""
+        return (await self._aget_text_embeddings([query]))[0]
+
+    def _get_text_embedding(self, text: str) -> list[float]:
+        """Get text embedding."""
+        return self._get_text_embeddings([text])[0]
+
+    async def _aget_text_embedding(self, text: str) -> list[float]:
+        """Asynchronously get text embedding."""
+        return (await self._aget_text_embeddings([text]))[0]
+
+    def _get_text_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Get text embeddings in one request.
+
+        Args:
+            texts (list[str]): Texts to embed.
+
+        Returns:
+            list[list[float]]: One L2-normalized embedding per text.
+
+        Raises:
+            httpx.HTTPStatusError: If the server rejects the request.
+        """
+        response = self._client.post("/embed", json=self._payload(texts))
+        response.raise_for_status()
+        return response.json()
+
+    async def _aget_text_embeddings(
+        self, texts: list[str]
+    ) -> list[list[float]]:
+        """Asynchronously get text embeddings in one request."""
+        response = await self._async_client.post(
+            "/embed", json=self._payload(texts)
+        )
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _payload(texts: list[str]) -> dict:
+        """Build the body of a TEI `/embed` request."""
+        return {"inputs": texts, "normalize": True, "truncate": True}
+
+
+def get_query_embedding_batch(
+    embed_model: BaseEmbedding, queries: list[str]
+) -> list[list[float]]:
+    """Embed several queries with the model's query encoding.
+
+    `BaseEmbedding.get_text_embedding_batch` uses the document encoding,
+    which differs from the query encoding for some FastEmbed models.
+
+    Args:
+        embed_model (BaseEmbedding): Model for embedding text.
+        queries (list[str]): Queries to embed.
+
+    Returns:
+        list[list[float]]: One embedding per query.
+    """
+    if isinstance(embed_model, FastEmbedEmbedding):
+        # pylint: disable=protected-access
+        return [
+            embedding.tolist()
+            for embedding in embed_model._model.query_embed(queries)
+        ]
+    if isinstance(embed_model, (BatchOllamaEmbedding, TEIEmbedding)):
+        # Both encode queries exactly like documents.
+        return embed_model.get_text_embedding_batch(queries)
+    return [embed_model.get_query_embedding(query) for query in queries]
+
+
+def embed_model_id(embed_model: BaseEmbedding) -> str:
+    """Identify the backend and model producing an embedding model's vectors.
+
+    Vectors of different backends are not comparable even for the same
+    model, as only some of them normalize their output, so the backend is
+    always part of the ID.
+
+    Args:
+        embed_model (BaseEmbedding): Model for embedding text.
+
+    Returns:
+        str: ID of the form `backend://model`.
+    """
+    if isinstance(embed_model, BatchOllamaEmbedding):
+        backend = "ollama"
+    elif isinstance(embed_model, FastEmbedEmbedding):
+        backend = "fastembed"
+    elif isinstance(embed_model, TEIEmbedding):
+        backend = "tei"
+    else:
+        backend = embed_model.class_name()
+    return f"{backend}://{embed_model.model_name}"
+
+
+def create_embed_model(
+    embed_model_name: str,
+    embed_batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+    keep_alive: Optional[Union[float, str]] = None,
+    cache_dir: Optional[str] = None,
+) -> BaseEmbedding:
+    """Create the embedding model selected by its configured name.
+
+    Names of the form `fastembed://model` run the model in-process with
+    ONNX Runtime, avoiding an HTTP round-trip per query, `tei://host:port`
+    selects a TEI server, and `ollama://model` or a bare model name select
+    Ollama.
+
+    Args:
+        embed_model_name (str): Configured embedding model name.
+        embed_batch_size (int): Number of texts embedded per request, at
+            most the limit of a TEI server.
+        keep_alive (float | str): How long Ollama keeps the model loaded,
+            where -1 keeps it loaded indefinitely.
+        cache_dir (str): Directory FastEmbed downloads models to, instead of
+            a temporary directory.
+
+    Returns:
+        BaseEmbedding: Model for embedding text.
+
+    Raises:
+        ValueError: If the name uses an unknown backend.
+        httpx.HTTPError: If a TEI server cannot be reached.
+    """
+    backend, _, model_name = embed_model_name.rpartition("://")
+    if backend in ("", "ollama"):
+        return BatchOllamaEmbedding(
+            model_name=model_name,
+            base_url=DEFAULT_OLLAMA_BASE_URL,
+            embed_batch_size=embed_batch_size,
+            keep_alive=keep_alive,
+        )
+    if backend == "fastembed":
+        return FastEmbedEmbedding(
+            model_name=model_name,
+            embed_batch_size=embed_batch_size,
+            cache_dir=cache_dir,
+        )
+    if backend == "tei":
+        return TEIEmbedding.from_server(
+            f"http://{model_name}", embed_batch_size
+        )
+    raise ValueError(f"Unknown embedding backend: {backend}")
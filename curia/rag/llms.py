@@ -0,0 +1,74 @@
+"""Language models used to answer queries.
+
+This module provides `create_llm`, which picks between a local Ollama model
+and a quantized model served by vLLM through its OpenAI-compatible API, and
+`warm_up_llm`, which loads the model before the first query.
+"""
+
+from typing import Optional, Union
+
+from llama_index.core.llms import LLM
+from llama_index.llms.ollama import Ollama
+from llama_index.llms.openai_like import OpenAILike
+
+DEFAULT_REQUEST_TIMEOUT = 120.0
+
+
+def create_llm(
+    llm_name: str,
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    keep_alive: Optional[Union[float, str]] = None,
+) -> LLM:
+    """Create the language model selected by its configured name.
+
+    Names of the form `vllm://host:port/model` select a vLLM server (for
+    example one started with `--quantization awq`), while `ollama://model`
+    or a bare model name select Ollama.
+
+    Args:
+        llm_name (str): Configured language model name.
+        request_timeout (float): Timeout of generation requests in seconds.
+        keep_alive (float | str): How long Ollama keeps the model loaded,
+            where -1 keeps it loaded indefinitely.
+
+    Returns:
+        LLM: Model for user queries.
+
+    Raises:
+        ValueError: If the name uses an unknown backend.
+    """
+    backend, _, model_name = llm_name.rpartition("://")
+    if backend in ("", "ollama"):
+        return Ollama(
+            model=model_name,
+            request_timeout=request_timeout,
+            keep_alive=keep_alive,
+        )
+    if backend == "vllm":
+        address, _, model_name = model_name.partition("/")
+        return OpenAILike(
+            model=model_name,
+            api_base=f"http://{address}/v1",
+            api_key="EMPTY",
+            api_version="",
+            max_tokens=None,
+            is_chat_model=True,
+            timeout=request_timeout,
+        )
+    raise ValueError(f"Unknown LLM backend: {backend}")
+
+
+def warm_up_llm(llm: LLM) -> None:
+    """Load the model into memory ahead of the first query.
+
+    Ollama loads a model when it receives an empty prompt, without generating
+    any tokens. vLLM loads its model when the server starts, so other
+    backends need nothing.
+
+    Args:
+        llm (LLM): Model for user queries.
+    """
+    if isinstance(llm, Ollama):
+        llm.client.generate(
+            model=llm.model, prompt="", keep_alive=llm.keep_alive
+        )
@@ -0,0 +1,72 @@
+"""A module for reading PDF judgments into llama-index documents.
+
+This module provides a `PDFReader` class that extracts the text of each PDF
+page with pypdf, flattening line breaks and tabs into spaces with a single
+`str.translate` call per page, and a `load_file` function that reads one file
+with it. `load_file` runs in ingestion worker processes, so this module must
+not import the vector store, embedding or LLM modules.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+import pypdf
+from fsspec import AbstractFileSystem  # type: ignore[import-untyped]
+from llama_index.core import SimpleDirectoryReader
+from llama_index.core.readers.base import BaseReader
+from llama_index.core.schema import Document
+
+_WHITESPACE_TABLE = str.maketrans("\n\r\t", "   ")
+
+
+class PDFReader(BaseReader):
+    """PDF reader returning one document per page."""
+
+    def load_data(
+        self,
+        file: Path,
+        extra_info: Optional[dict] = None,
+        fs: Optional[AbstractFileSystem] = None,
+    ) -> list[Document]:
+        """Read a PDF file.
+
+        Args:
+            file (Path): Path to the PDF file.
+            extra_info (dict): Metadata added to every page document.
+            fs (AbstractFileSystem): Filesystem to read the file from.
+
+        Returns:
+            list[Document]: One document per non-blank page, in page order.
+        """
+        file = Path(file)
+        documents = []
+        with fs.open(str(file), "rb") if fs else open(file, "rb") as stream:
+            pdf = pypdf.PdfReader(stream)
+            for number, page in enumerate(pdf.pages):
+                text = page.extract_text().translate(_WHITESPACE_TABLE).strip()
+                if not text:
+                    continue
+                metadata = {
+                    "page_label": pdf.page_labels[number],
+                    "file_name": file.name,
+                }
+                metadata.update(extra_info or {})
+                documents.append(Document(text=text, metadata=metadata))
+        return documents
+
+
+def load_file(path: str) -> list[Document]:
+    """Load the documents of a single file.
+
+    Defined at module level so it can run in worker processes.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        list[Document]: Loaded documents.
+    """
+    reader = SimpleDirectoryReader(
+        input_files=[path], file_extractor={".pdf": PDFReader()}
+    )
+    return reader.load_data()
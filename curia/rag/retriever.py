@@ -0,0 +1,107 @@
+"""A retriever that batches the queries of concurrent requests.
+
+This module provides a `BatchingRetriever` class that collects the queries
+arriving within a short window on a worker thread and retrieves them with a
+single batched call, so that embedding and searching are paid for once per
+batch instead of once per query under concurrent load.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+from llama_index.core.base.base_retriever import BaseRetriever
+from llama_index.core.callbacks import CallbackManager
+from llama_index.core.schema import NodeWithScore, QueryBundle
+
+DEFAULT_BATCH_WINDOW = 0.01
+DEFAULT_MAX_BATCH_SIZE = 32
+
+_Request = tuple[str, "Future[list[NodeWithScore]]"]
+
+
+class BatchingRetriever(BaseRetriever):
+    """Retriever that groups concurrent queries into batched calls."""
+
+    def __init__(
+        self,
+        retrieve_batch: Callable[[list[str]], list[list[NodeWithScore]]],
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        callback_manager: Optional[CallbackManager] = None,
+    ) -> None:
+        """Initialize the BatchingRetriever.
+
+        Args:
+            retrieve_batch (Callable): Function retrieving the documents of
+                several queries, in order.
+            batch_window (float): Seconds to wait for more queries after the
+                first query of a batch arrives.
+            max_batch_size (int): Maximum number of queries per batch.
+            callback_manager (CallbackManager): Callback manager.
+        """
+        super().__init__(callback_manager=callback_manager)
+        self._retrieve_batch = retrieve_batch
+        self._batch_window = batch_window
+        self._max_batch_size = max_batch_size
+        self._requests: queue.SimpleQueue[_Request] = queue.SimpleQueue()
+        threading.Thread(
+            target=self._run, name="BatchingRetriever", daemon=True
+        ).start()
+
+    def _submit(self, query: str) -> "Future[list[NodeWithScore]]":
+        """Queue a query for the next batch.
+
+        Args:
+            query (str): Query string.
+
+        Returns:
+            Future: Documents retrieved for the query.
+        """
+        future: Future[list[NodeWithScore]] = Future()
+        self._requests.put((query, future))
+        return future
+
+    def _retrieve(self, query_bundle: QueryBundle) -> list[NodeWithScore]:
+        """Retrieve documents for a query as part of a batch."""
+        return self._submit(query_bundle.query_str).result()
+
+    async def _aretrieve(
+        self, query_bundle: QueryBundle
+    ) -> list[NodeWithScore]:
+        """Asynchronously retrieve documents for a query in a batch."""
+        return await asyncio.wrap_future(self._submit(query_bundle.query_str))
+
+    def _next_batch(self) -> list[_Request]:
+        """Wait for a query, then collect those arriving within the window.
+
+        Returns:
+            list: Queries of the batch with their futures.
+        """
+        batch = [self._requests.get()]
+        deadline = time.monotonic() + self._batch_window
+        while len(batch) < self._max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._requests.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        """Retrieve batches of queries until the process exits."""
+        while True:
+            batch = self._next_batch()
+            try:
+                results = self._retrieve_batch([query for query, _ in batch])
+            except Exception as error:  # pylint: disable=broad-except
+                for _, future in batch:
+                    future.set_exception(error)
+                continue
+            for (_, future), nodes in zip(batch, results):
+                future.set_result(nodes)
@@ -0,0 +1,75 @@
+"""A module for splitting document text into overlapping word windows.
+
+This module provides a `WordSplitter` class that locates word boundaries once
+with a regular expression and slices each chunk directly out of the original
+text, instead of re-tokenizing and re-joining words for every chunk.
+"""
+
+import re
+
+from llama_index.core.bridge.pydantic import Field, model_validator
+from llama_index.core.node_parser.interface import TextSplitter
+
+DEFAULT_CHUNK_SIZE = 150
+DEFAULT_CHUNK_OVERLAP = 20
+
+_WORD_PATTERN = re.compile(r"\S+")
+
+
+class WordSplitter(TextSplitter):
+    """Text splitter producing overlapping windows of whole words."""
+
+    chunk_size: int = Field(
+        default=DEFAULT_CHUNK_SIZE,
+        description="The number of words in each chunk.",
+        gt=0,
+    )
+    chunk_overlap: int = Field(
+        default=DEFAULT_CHUNK_OVERLAP,
+        description="The number of words shared by consecutive chunks.",
+        ge=0,
+    )
+
+    @model_validator(mode="after")
+    def _check_overlap(self) -> "WordSplitter":
+        """Ensure consecutive chunks always advance through the text.
+
+        Raises:
+            ValueError: If the overlap is not smaller than the chunk size.
+        """
+        if self.chunk_overlap >= self.chunk_size:
+            raise ValueError(
+                f"Chunk overlap ({self.chunk_overlap}) must be smaller than "
+                f"chunk size ({self.chunk_size})."
+            )
+        return self
+
+    @classmethod
+    def class_name(cls) -> str:
+        """Return the class name."""
+        return "WordSplitter"
+
+    def split_text(self, text: str) -> list[str]:
+        """Split text into overlapping word windows.
+
+        Args:
+            text (str): Text to split.
+
+        Returns:
+            list[str]: Chunks of the original text, in order. The last
+                chunk always ends with the last word, even when fewer than
+                `chunk_overlap` words remain.
+        """
+        starts, ends = [], []
+        for match in _WORD_PATTERN.finditer(text):
+            starts.append(match.start())
+            ends.append(match.end())
+
+        chunks = []
+        stride = self.chunk_size - self.chunk_overlap
+        for start in range(0, len(starts), stride):
+            end = min(start + self.chunk_size, len(starts))
+            chunks.append(text[starts[start] : ends[end - 1]])
+            if end == len(starts):
+                break
+        return chunks
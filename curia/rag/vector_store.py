@@ -1,34 +1,108 @@
-"""A module for managing a vector store using ChromaDB and Ollama embeddings.
+"""A module for managing a vector store using ChromaDB.
 
 This module provides a `VectorStore` class that uses a ChromaDB collection,
 loads documents from a specified directory,
-and processes them using Ollama embeddings.
+and embeds them in batches with FastEmbed, Ollama or a TEI server.
 It supports querying and retrieving documents from the vector store.
 """
 
+import hashlib
 import json
 import logging
+import math
+import multiprocessing
 import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from typing import Iterator
 
 import chromadb
+import numpy as np
 import yaml
-from llama_index.core import (
-    SimpleDirectoryReader,
-    StorageContext,
-    VectorStoreIndex,
-)
+from chromadb.types import InclusionExclusionOperator, LiteralValue, Where
 from llama_index.core.base.base_query_engine import BaseQueryEngine
 from llama_index.core.base.base_retriever import BaseRetriever
-from llama_index.core.schema import Document
-from llama_index.embeddings.ollama import OllamaEmbedding
-from llama_index.llms.ollama import Ollama
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.constants import DEFAULT_SIMILARITY_TOP_K
+from llama_index.core.llms import LLM
+from llama_index.core.query_engine import RetrieverQueryEngine
+from llama_index.core.schema import (
+    BaseNode,
+    Document,
+    MetadataMode,
+    NodeWithScore,
+)
+from llama_index.core.vector_stores.utils import metadata_dict_to_node
 from llama_index.vector_stores.chroma import ChromaVectorStore
 
 from curia.params import CONFIG_PATH
+from curia.rag.embeddings import (
+    DEFAULT_EMBED_BATCH_SIZE,
+    create_embed_model,
+    embed_model_id,
+    get_query_embedding_batch,
+)
+from curia.rag.llms import create_llm, warm_up_llm
+from curia.rag.pdf_reader import load_file
+from curia.rag.retriever import DEFAULT_BATCH_WINDOW, BatchingRetriever
+from curia.rag.text_splitter import (
+    DEFAULT_CHUNK_OVERLAP,
+    DEFAULT_CHUNK_SIZE,
+    WordSplitter,
+)
+
+INGEST_BATCHES_PER_EMBED_BATCH = 4
+MAX_DEFAULT_WORKERS = 4
+
+DEFAULT_HNSW = {
+    "space": "cosine",
+    "construction_ef": 200,
+    "M": 32,
+    "search_ef": 64,
+}
+
+
+def _hash_file(path: str) -> str:
+    """Compute the SHA-256 digest of a file's content.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        str: Hexadecimal digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file_handle:
+        for block in iter(lambda: file_handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _chunk_id(node: BaseNode) -> str:
+    """Derive a stable chunk ID from its file, page and text.
+
+    Unchanged chunks keep their ID when a file is re-indexed, so they are
+    found in the collection and not embedded again.
+
+    Args:
+        node (BaseNode): Chunk of a document.
+
+    Returns:
+        str: Hexadecimal BLAKE2b digest.
+    """
+    key = "\0".join(
+        [
+            node.metadata.get("file_name", ""),
+            node.metadata.get("page_label", ""),
+            node.get_content(metadata_mode=MetadataMode.NONE),
+        ]
+    )
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
 
 
 class VectorStore:
-    """A vector store implementation using ChromaDB and Ollama."""
+    """A vector store implementation using ChromaDB."""
 
     def __init__(
         self,
@@ -51,24 +125,92 @@ class VectorStore:
         db_path = kwargs.get(
             "db_path", config.get("data", {}).get("db_path", "data/databases/")
         )
+        db_host = kwargs.get("db_host", config.get("data", {}).get("db_host"))
+        db_port = kwargs.get(
+            "db_port", config.get("data", {}).get("db_port", 8000)
+        )
         collection_name = kwargs.get(
             "collection_name",
             config.get("data", {}).get("collection_name", "curia_docs"),
         )
+        hnsw = {
+            **DEFAULT_HNSW,
+            **kwargs.get("hnsw", config.get("data", {}).get("hnsw", {})),
+        }
+        insert_batch_size = kwargs.get(
+            "insert_batch_size",
+            config.get("data", {}).get("insert_batch_size"),
+        )
+        chunk_size = kwargs.get(
+            "chunk_size",
+            config.get("data", {}).get("chunk_size", DEFAULT_CHUNK_SIZE),
+        )
+        chunk_overlap = kwargs.get(
+            "chunk_overlap",
+            config.get("data", {}).get("chunk_overlap", DEFAULT_CHUNK_OVERLAP),
+        )
+        num_workers = kwargs.get(
+            "num_workers",
+            config.get("data", {}).get(
+                "num_workers", min(os.cpu_count() or 1, MAX_DEFAULT_WORKERS)
+            ),
+        )
         embed_model_name = kwargs.get(
             "embed_model_name",
             config.get("models", {}).get(
-                "embed_model_name", "all-minilm:l6-v2"
+                "embed_model_name",
+                "fastembed://sentence-transformers/all-MiniLM-L6-v2",
             ),
         )
         llm_name = kwargs.get(
             "llm_name",
             config.get("models", {}).get("llm_name", "initium/law_model"),
         )
+        embed_cache_dir = kwargs.get(
+            "embed_cache_dir",
+            config.get("models", {}).get("embed_cache_dir"),
+        )
+        keep_alive = kwargs.get(
+            "keep_alive", config.get("models", {}).get("keep_alive", -1)
+        )
+        warm_up = kwargs.get(
+            "warm_up", config.get("models", {}).get("warm_up", True)
+        )
+        embed_batch_size = kwargs.get(
+            "embed_batch_size",
+            config.get("models", {}).get(
+                "embed_batch_size", DEFAULT_EMBED_BATCH_SIZE
+            ),
+        )
 
         self.paths = {"data": data_path, "db": db_path}
+        self.db_server = {"host": db_host, "port": db_port}
         self.collection_name = collection_name
+        self.collection_metadata = {
+            f"hnsw:{key}": value for key, value in hnsw.items()
+        }
         self.model_names = {"embed_model": embed_model_name, "llm": llm_name}
+        self.embed_batch_size = embed_batch_size
+        self.embed_cache_dir = embed_cache_dir
+        self.keep_alive = keep_alive
+        self.warm_up = warm_up
+        self.insert_batch_size = insert_batch_size
+        self.ingest_batch_size = kwargs.get(
+            "ingest_batch_size",
+            config.get("data", {}).get(
+                "ingest_batch_size",
+                INGEST_BATCHES_PER_EMBED_BATCH * embed_batch_size,
+            ),
+        )
+        self.num_workers = num_workers
+        self.chunking = {
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+        }
+        self.similarity_top_k = kwargs.get(
+            "similarity_top_k", DEFAULT_SIMILARITY_TOP_K
+        )
+        self.batch_window = kwargs.get("batch_window", DEFAULT_BATCH_WINDOW)
         self.restart_database = restart_database
 
         self.logger = logging.getLogger("VectorStore")
@@ -77,30 +219,40 @@ class VectorStore:
             "Data path: %s\n"
             "DB path: %s\n"
             "Collection: %s\n"
-            "Embed model: %s\n"
+            "Embed model: %s (batch size %d)\n"
             "LLM: %s",
             data_path,
             db_path,
             collection_name,
             embed_model_name,
+            embed_batch_size,
             llm_name,
         )
 
-        collection = self._init_database()
-        if self.restart_database:
-            ids = collection.get()["ids"]
-            if ids:
-                collection.delete(ids)
-            self.logger.info("Database restart requested. Deleting all data.")
+        self.embed_model, llm = self._init_model()
+        self.collection_metadata["embed_model"] = embed_model_id(
+            self.embed_model
+        )
 
-        embed_model, llm = self._init_model()
+        self.collection = self._init_database()
+        self._setup_vector_store(self.collection, self.embed_model)
         self.query_engine, self.retrieval_engine = self._setup_query_engines(
-            self._setup_vector_store(collection, embed_model), llm, **kwargs
+            llm, **kwargs
         )
 
     def _init_database(self) -> chromadb.Collection:
         """Initialize the ChromaDB client and collection.
 
+        Uses a Chroma server (started with `chroma run --path <db_path>`)
+        when a database host is configured, and a local persistent client
+        otherwise. The collection is recreated, and all files re-indexed,
+        when a restart is requested or when it was embedded with a different
+        model, or before the model was recorded in its metadata. ChromaDB
+        keeps the metadata of existing collections, so other differences
+        from the configured metadata, such as HNSW settings, are only logged.
+        The processed files record is kept on local disk, so it is ignored
+        when the collection is empty, such as a new collection on a server.
+
         Returns:
             chromadb.Collection: A chromaDB collection of documents.
 
@@ -108,50 +260,143 @@ class VectorStore:
             Exception: If initialization fails.
         """
         try:
-            client = chromadb.PersistentClient(path=self.paths["db"])
-            collection = client.get_or_create_collection(self.collection_name)
-            self.logger.info("Collection %s ready", self.collection_name)
+            client: chromadb.ClientAPI
+            if self.db_server["host"]:
+                client = chromadb.HttpClient(**self.db_server)
+            else:
+                client = chromadb.PersistentClient(path=self.paths["db"])
+            collection = client.get_or_create_collection(
+                self.collection_name, metadata=self.collection_metadata
+            )
+            if self._needs_recreation(collection.metadata or {}):
+                client.delete_collection(self.collection_name)
+                collection = client.create_collection(
+                    self.collection_name, metadata=self.collection_metadata
+                )
+                self.restart_database = True
+            elif collection.count() == 0:
+                self.logger.info(
+                    "Collection %s is empty, indexing all files",
+                    self.collection_name,
+                )
+                self.restart_database = True
+            if self.insert_batch_size is None:
+                self.insert_batch_size = client.get_max_batch_size()
+            self.logger.info(
+                "Collection %s ready (insert batch size %d)",
+                self.collection_name,
+                self.insert_batch_size,
+            )
             return collection
         except Exception as error:
             self.logger.error("Database initialization failed: %s", str(error))
             raise
 
-    def _init_model(self) -> tuple[OllamaEmbedding, Ollama]:
+    def _needs_recreation(self, metadata: dict) -> bool:
+        """Check whether the existing collection has to be recreated.
+
+        Args:
+            metadata (dict): Metadata of the existing collection.
+
+        Returns:
+            bool: Whether a restart was requested or the collection was
+                embedded with another model.
+        """
+        embed_model = self.collection_metadata["embed_model"]
+        if self.restart_database:
+            self.logger.info("Database restart requested. Deleting all data.")
+            return True
+        if metadata.get("embed_model") != embed_model:
+            self.logger.warning(
+                "Collection %s was embedded with %s, re-indexing with %s",
+                self.collection_name,
+                metadata.get("embed_model"),
+                embed_model,
+            )
+            return True
+        if metadata != self.collection_metadata:
+            self.logger.warning(
+                "Collection %s has metadata %s instead of the configured %s, "
+                "restart the database to apply it",
+                self.collection_name,
+                metadata,
+                self.collection_metadata,
+            )
+        return False
+
+    def _init_model(self) -> tuple[BaseEmbedding, LLM]:
         """Initialize the embedding model and LLM.
 
         Returns:
-            OllamaEmbedding: Model for embedding text.
+            BaseEmbedding: Model for embedding text.
             llm: Model for user queries.
 
         Raises:
             Exception: If model initialization fails.
         """
         try:
-            embed_model = OllamaEmbedding(
-                model_name=self.model_names["embed_model"]
+            embed_model = create_embed_model(
+                self.model_names["embed_model"],
+                self.embed_batch_size,
+                keep_alive=self.keep_alive,
+                cache_dir=self.embed_cache_dir,
             )
             self.logger.info("Model %s ready", self.model_names["embed_model"])
 
-            llm = Ollama(model=self.model_names["llm"], request_timeout=120.0)
+            llm = create_llm(
+                self.model_names["llm"], keep_alive=self.keep_alive
+            )
             self.logger.info("Model %s ready", self.model_names["llm"])
 
+            if self.warm_up:
+                self._warm_up_models(embed_model, llm)
+
             return embed_model, llm
 
         except Exception as error:  # pylint: disable=broad-except
             self.logger.error("Model initialization failed: %s", str(error))
             raise
 
+    def _warm_up_models(self, embed_model: BaseEmbedding, llm: LLM) -> None:
+        """Load both models concurrently, ahead of the first query.
+
+        Failures are only logged, as the models are loaded on first use
+        anyway.
+
+        Args:
+            embed_model (BaseEmbedding): Model for embedding text.
+            llm (LLM): Model for user queries.
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            warm_ups: list[tuple[str, Future]] = [
+                (
+                    self.model_names["embed_model"],
+                    executor.submit(embed_model.get_text_embedding, "warmup"),
+                ),
+                (
+                    self.model_names["llm"],
+                    executor.submit(warm_up_llm, llm),
+                ),
+            ]
+        for model_name, warm_up in warm_ups:
+            error = warm_up.exception()
+            if error is None:
+                self.logger.info("Model %s warmed up", model_name)
+            else:
+                self.logger.warning(
+                    "Model %s warm-up failed: %s", model_name, str(error)
+                )
+
     def _setup_vector_store(
-        self, collection: chromadb.Collection, embed_model: OllamaEmbedding
-    ) -> VectorStoreIndex:
-        """Set up the vector store, process new documents, and create indices.
+        self,
+        collection: chromadb.Collection,
+        embed_model: BaseEmbedding,
+    ) -> None:
+        """Set up the vector store and index new documents.
 
         Args:
             chromadb.Collection: ChromaDB collection.
-            OllamaEmbedding: Text embedding model.
-
-        Returns:
-            VectorStoreIndex: Created index.
+            BaseEmbedding: Text embedding model.
 
         Raises:
             Exception: If vector storage setup fails.
@@ -163,21 +408,22 @@ class VectorStore:
             processed_files = self._load_processed_files(
                 processed_files_record
             )
-            all_files = self._get_all_files()
+            all_files = self._get_all_files(processed_files)
             new_files = self._get_new_files(processed_files, all_files)
             self.logger.info("Found %d new/updated files", len(new_files))
-            documents = self._load_documents(new_files)
-            index = self._create_index(
-                new_files,
-                documents,
+            vector_store = ChromaVectorStore(chroma_collection=collection)
+            chunk_ids = self._index_documents(
+                vector_store, embed_model, new_files
+            )
+            self._delete_stale_documents(
                 collection,
-                embed_model,
+                [file for file in new_files if file in processed_files],
+                chunk_ids,
             )
             self._update_and_save_processed_files(
                 processed_files_record, processed_files, all_files
             )
             self.logger.info("Vectors ready")
-            return index
         except Exception as error:  # pylint: disable=broad-except
             self.logger.error("Vector storage failed: %s", str(error))
             raise
@@ -189,7 +435,7 @@ class VectorStore:
             processed_files_record (str): Path to the processed files JSON.
 
         Returns:
-            dict: Dictionary of processed files and their modification times.
+            dict: Dictionary mapping processed files to their records.
         """
         if (
             os.path.exists(processed_files_record)
@@ -201,85 +447,212 @@ class VectorStore:
                 return json.load(file_handle)
         return {}
 
-    def _get_all_files(self) -> dict:
-        """Retrieve all files in the data directory with modification times.
+    def _get_all_files(self, processed_files: dict) -> dict:
+        """Retrieve PDF files in the data directory with their records.
+
+        Uses `os.scandir`, whose entries carry cached file type and stat
+        information on most filesystems. Only files whose modification time
+        differs from their record are read and hashed.
+
+        Args:
+            processed_files (dict): Previously processed files.
 
         Returns:
-            dict: Dictionary mapping filenames to modification times.
+            dict: Dictionary mapping filenames to their modification time
+                and content hash.
         """
-        return {
-            file: os.path.getmtime(os.path.join(self.paths["data"], file))
-            for file in os.listdir(self.paths["data"])
-        }
+        all_files = {}
+        with os.scandir(self.paths["data"]) as entries:
+            for entry in entries:
+                if not (
+                    entry.is_file() and entry.name.lower().endswith(".pdf")
+                ):
+                    continue
+                mtime = entry.stat().st_mtime
+                record = processed_files.get(entry.name)
+                if not isinstance(record, dict) or record["mtime"] != mtime:
+                    record = {"mtime": mtime, "sha256": _hash_file(entry.path)}
+                all_files[entry.name] = record
+        return all_files
 
     def _get_new_files(self, processed_files: dict, all_files: dict) -> list:
         """Identify new or modified files.
 
+        Files are compared by content hash, so touched but unchanged files
+        are not re-indexed. Records from before hashes were stored only
+        hold a modification time, which is compared instead.
+
         Args:
             processed_files (dict): Previously processed files.
-            all_files (dict): Current files with modification times.
+            all_files (dict): Current files with their records.
 
         Returns:
             list: List of new or modified filenames.
         """
-        return [
-            file
-            for file, mtime in all_files.items()
-            if file not in processed_files
-            or mtime > processed_files.get(file, 0)
-        ]
+        new_files = []
+        for file, record in all_files.items():
+            processed = processed_files.get(file)
+            if isinstance(processed, dict):
+                modified = processed["sha256"] != record["sha256"]
+            else:
+                modified = processed is None or record["mtime"] > processed
+            if modified:
+                new_files.append(file)
+        return new_files
+
+    def _delete_stale_documents(
+        self,
+        collection: chromadb.Collection,
+        updated_files: list[str],
+        chunk_ids: set[str],
+    ) -> None:
+        """Delete the chunks of re-indexed files that are no longer present.
+
+        Args:
+            collection (chromadb.Collection): ChromaDB collection.
+            updated_files (list[str]): Previously processed files that have
+                since been modified.
+            chunk_ids (set[str]): IDs of the current chunks of new files.
+        """
+        if not updated_files:
+            return
+        file_names: dict[InclusionExclusionOperator, list[LiteralValue]] = {
+            "$in": [*updated_files]
+        }
+        where: Where = {"file_name": file_names}
+        stale_ids = set(collection.get(where=where, include=[])["ids"])
+        stale_ids -= chunk_ids
+        if stale_ids:
+            self.logger.info(
+                "Deleting %d outdated chunks of %d updated files",
+                len(stale_ids),
+                len(updated_files),
+            )
+            collection.delete(ids=list(stale_ids))
 
-    def _load_documents(self, new_files: list):
-        """Load documents from new files using SimpleDirectoryReader.
+    def _iter_documents(
+        self, new_files: list[str]
+    ) -> Iterator[list[Document]]:
+        """Load documents from new files one file at a time.
+
+        PDF parsing is CPU-bound pure Python, so files are parsed in
+        parallel worker processes rather than threads. At most two files
+        per worker are parsed ahead of the consumer.
 
         Args:
-            new_files (list): List of new or modified filenames.
+            new_files (list[str]): List of new or modified filenames.
 
-        Returns:
-            list: Loaded documents, or None if no new files.
+        Yields:
+            list[Document]: Documents of each file, in the order of
+                `new_files`.
         """
-        if not new_files:
-            self.logger.info("Using existing vector store")
-            return None
-        reader = SimpleDirectoryReader(
-            input_files=[
-                os.path.join(self.paths["data"], file) for file in new_files
-            ]
-        )
-        return reader.load_data()
+        paths = [os.path.join(self.paths["data"], file) for file in new_files]
+        num_workers = min(self.num_workers or 1, len(paths))
+        if num_workers <= 1:
+            yield from map(load_file, paths)
+            return
+
+        with ProcessPoolExecutor(
+            num_workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            remaining_paths = iter(paths)
+            pending = deque(
+                executor.submit(load_file, path)
+                for path in islice(remaining_paths, 2 * num_workers)
+            )
+            while pending:
+                documents = pending.popleft().result()
+                pending.extend(
+                    executor.submit(load_file, path)
+                    for path in islice(remaining_paths, 1)
+                )
+                yield documents
+
+    def _iter_node_batches(
+        self, new_files: list[str]
+    ) -> Iterator[list[BaseNode]]:
+        """Chunk new files into batches of `ingest_batch_size` nodes.
+
+        Batches are a few embedding batches long, and never longer than
+        ChromaDB accepts in one write, so that ingestion holds little in
+        memory and embedding overlaps with writes even for small corpora.
 
-    def _create_index(
+        Args:
+            new_files (list[str]): List of new or modified filenames.
+
+        Yields:
+            list[BaseNode]: Consecutive chunks of one or more files, with
+                content-derived IDs that are unique within the batch.
+        """
+        # Neighbour relationships would point to the splitter's random IDs.
+        splitter = WordSplitter(**self.chunking, include_prev_next_rel=False)
+        batch_size = min(self.ingest_batch_size, self.insert_batch_size)
+        nodes: dict[str, BaseNode] = {}
+        for documents in self._iter_documents(new_files):
+            for node in splitter(documents):
+                node.id_ = _chunk_id(node)
+                nodes.setdefault(node.id_, node)
+                if len(nodes) >= batch_size:
+                    yield list(nodes.values())
+                    nodes = {}
+        if nodes:
+            yield list(nodes.values())
+
+    def _index_documents(
         self,
+        vector_store: ChromaVectorStore,
+        embed_model: BaseEmbedding,
         new_files: list[str],
-        documents: list[Document],
-        collection: chromadb.Collection,
-        embed_model: OllamaEmbedding,
-    ) -> VectorStoreIndex:
-        """Create VectorStoreIndex from documents or existing vector store.
+    ) -> set[str]:
+        """Chunk, embed and store new files.
+
+        Ingestion runs as a three-stage pipeline: worker processes parse
+        upcoming files, the calling thread chunks and embeds the current
+        batch, and a writer thread stores the previous batch in ChromaDB.
+        Files are streamed through it, so only a few batches of chunks are
+        held in memory instead of every page of every new file. Chunks whose
+        IDs are already in the collection are neither embedded nor stored
+        again, and neither are repeated chunks of the new files.
 
         Args:
-            new_files (list): List of new or modified filenames.
-            list[Document]: Loaded documents.
-            chromadb.Collection: ChromaDB collection.
-            OllamaEmbedding: Text embedding model.
+            vector_store (ChromaVectorStore): Vector store to add chunks to.
+            embed_model (BaseEmbedding): Text embedding model.
+            new_files (list[str]): List of new or modified filenames.
 
         Returns:
-            VectorStoreIndex: Created index.
+            set[str]: IDs of all chunks of the new files.
         """
-        vector_store = ChromaVectorStore(chroma_collection=collection)
-        storage_context = StorageContext.from_defaults(
-            vector_store=vector_store
-        )
-
-        if new_files:
-            return VectorStoreIndex.from_documents(
-                documents,
-                storage_context=storage_context,
-                embed_model=embed_model,
-            )
-        return VectorStoreIndex.from_vector_store(
-            vector_store, embed_model=embed_model
-        )
+        chunk_ids: set[str] = set()
+        if not new_files:
+            self.logger.info("Using existing vector store")
+            return chunk_ids
+        with ThreadPoolExecutor(max_workers=1) as writer:
+            pending_write = None
+            for nodes in self._iter_node_batches(new_files):
+                # The previous batch may not be written yet, so its IDs are
+                # skipped here rather than looked up in the collection.
+                nodes = [
+                    node for node in nodes if node.node_id not in chunk_ids
+                ]
+                if not nodes:
+                    continue
+                batch_ids = [node.node_id for node in nodes]
+                chunk_ids.update(batch_ids)
+                stored_ids = set(
+                    vector_store.client.get(ids=batch_ids, include=[])["ids"]
+                )
+                nodes = [
+                    node for node in nodes if node.node_id not in stored_ids
+                ]
+                if not nodes:
+                    continue
+                embed_model(nodes)
+                if pending_write is not None:
+                    pending_write.result()
+                pending_write = writer.submit(vector_store.add, nodes)
+            if pending_write is not None:
+                pending_write.result()
+        return chunk_ids
 
     def _update_and_save_processed_files(
         self,
@@ -289,37 +662,49 @@ class VectorStore:
     ) -> None:
         """Update processed files metadata and save to JSON.
 
+        The record is only rewritten when it changed, and is replaced
+        atomically so an interrupted run cannot leave it truncated.
+
         Args:
             processed_files_record (str): Path to the JSON record.
             processed_files (dict): Previously processed files.
-            all_files (dict): Current files with modification times.
+            all_files (dict): Current files with their records.
         """
+        if all_files.items() <= processed_files.items():
+            self.logger.debug("Processed files record is up to date")
+            return
         self.logger.debug(
             "Updating processed files record (total tracked: %d)",
             len(all_files),
         )
         processed_files.update(all_files)
-        with open(
-            processed_files_record, "w", encoding="utf-8"
-        ) as file_handle:
-            json.dump(processed_files, file_handle)
+        temporary_record = f"{processed_files_record}.tmp"
+        with open(temporary_record, "w", encoding="utf-8") as file_handle:
+            json.dump(processed_files, file_handle, separators=(",", ":"))
+        os.replace(temporary_record, processed_files_record)
 
     def _setup_query_engines(
-        self, index: VectorStoreIndex, llm: Ollama, **kwargs
+        self, llm: LLM, **kwargs
     ) -> tuple[BaseQueryEngine, BaseRetriever]:
-        """Set up query and retrieval engines from the index.
+        """Set up query and retrieval engines on top of `retrieve_batch`.
+
+        Both engines share a retriever that batches the queries of
+        concurrent requests.
 
         Args:
-            index (VectorStoreIndex): Index to create engines from.
-            llm (Ollama): Language model for user queries.
+            llm (LLM): Language model for user queries.
 
         Returns:
             BaseQueryEngine: Query engine.
-            BaseRetriever: Eetrieval engine.
+            BaseRetriever: Retrieval engine.
         """
         self.logger.info("Initializing query engines")
-        query_engine = index.as_query_engine(llm=llm, **kwargs)
-        retrieval_engine = index.as_retriever()
+        retrieval_engine = BatchingRetriever(
+            self.retrieve_batch, batch_window=self.batch_window
+        )
+        query_engine = RetrieverQueryEngine.from_args(
+            retrieval_engine, llm=llm, **kwargs
+        )
 
         return query_engine, retrieval_engine
 
@@ -337,6 +722,8 @@ class VectorStore:
     def retrieve(self, query: str):
         """Retrieve documents from the vector store.
 
+        Concurrent calls are grouped into a single `retrieve_batch` call.
+
         Args:
             query (str): Query string.
 
@@ -345,6 +732,47 @@ class VectorStore:
         """
         return self.retrieval_engine.retrieve(query)
 
+    def retrieve_batch(self, queries: list[str]) -> list[list[NodeWithScore]]:
+        """Retrieve documents for several queries at once.
+
+        All queries are embedded together, with the model's query
+        encoding, and searched with a single ChromaDB query, instead of one
+        round-trip of each per query. The
+        embeddings are handed to ChromaDB as one contiguous float32 matrix,
+        which it uses as is rather than converting row by row.
+
+        Args:
+            queries (list[str]): Query strings.
+
+        Returns:
+            list[list[NodeWithScore]]: Retrieved documents for each query,
+                in the order of `queries`.
+        """
+        if not queries:
+            return []
+        query_embeddings = np.asarray(
+            get_query_embedding_batch(self.embed_model, queries),
+            dtype=np.float32,
+        )
+        results = self.collection.query(
+            query_embeddings=query_embeddings,
+            n_results=self.similarity_top_k,
+        )
+        return [
+            [
+                NodeWithScore(
+                    node=metadata_dict_to_node(dict(metadata), text=text),
+                    score=math.exp(-distance),
+                )
+                for text, metadata, distance in zip(texts, metadatas, dists)
+            ]
+            for texts, metadatas, dists in zip(
+                results["documents"] or [],
+                results["metadatas"] or [],
+                results["distances"] or [],
+            )
+        ]
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
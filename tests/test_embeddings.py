@@ -0,0 +1,205 @@
+"""Test module for embedding model functionality."""
+
+import asyncio
+import json
+import unittest
+from unittest.mock import patch
+
+import httpx
+import numpy as np
+from fastembed.text.onnx_embedding import OnnxTextEmbedding
+from llama_index.embeddings.fastembed import FastEmbedEmbedding
+from ollama import ResponseError
+
+from curia.rag.embeddings import (
+    BatchOllamaEmbedding,
+    TEIEmbedding,
+    create_embed_model,
+    embed_model_id,
+    get_query_embedding_batch,
+)
+
+
+class TestBatchOllamaEmbedding(unittest.TestCase):
+    """Test case for BatchOllamaEmbedding class."""
+
+    def test_retry_in_halves(self):
+        """Test that failing batches are split until they succeed."""
+        calls = []
+
+        def embed(texts):
+            calls.append(len(texts))
+            if len(texts) > 2:
+                raise ResponseError("out of memory", 500)
+            return [[float(text)] for text in texts]
+
+        embed_model = BatchOllamaEmbedding(model_name="dummy")
+        with patch.object(
+            BatchOllamaEmbedding,
+            "get_general_text_embeddings",
+            side_effect=embed,
+        ):
+            embeddings = embed_model.get_text_embedding_batch(
+                ["0", "1", "2", "3", "4"]
+            )
+
+        self.assertEqual(embeddings, [[0.0], [1.0], [2.0], [3.0], [4.0]])
+        self.assertEqual(calls, [5, 2, 3, 1, 2])
+
+    def test_async_retry_in_halves(self):
+        """Test that failing async batches are split until they succeed."""
+        calls = []
+
+        async def embed(texts):
+            calls.append(len(texts))
+            if len(texts) > 2:
+                raise httpx.ReadTimeout("timed out")
+            return [[float(text)] for text in texts]
+
+        embed_model = BatchOllamaEmbedding(model_name="dummy")
+        with patch.object(
+            BatchOllamaEmbedding,
+            "aget_general_text_embeddings",
+            side_effect=embed,
+        ):
+            embeddings = asyncio.run(
+                embed_model.aget_text_embedding_batch(
+                    ["0", "1", "2", "3", "4"]
+                )
+            )
+
+        self.assertEqual(embeddings, [[0.0], [1.0], [2.0], [3.0], [4.0]])
+        self.assertEqual(calls, [5, 2, 3, 1, 2])
+
+    def test_client_errors_are_raised(self):
+        """Test that client errors are not retried."""
+        embed_model = BatchOllamaEmbedding(model_name="dummy")
+        with patch.object(
+            BatchOllamaEmbedding,
+            "get_general_text_embeddings",
+            side_effect=ResponseError("model not found", 404),
+        ) as embed:
+            with self.assertRaises(ResponseError):
+                embed_model.get_text_embedding_batch(["0", "1"])
+        self.assertEqual(embed.call_count, 1)
+
+
+class TestTEIEmbedding(unittest.TestCase):
+    """Test case for TEIEmbedding class."""
+
+    def test_get_text_embedding_batch(self):
+        """Test that a batch is embedded in one TEI request."""
+        requests = []
+
+        def handler(request):
+            requests.append(json.loads(request.content))
+            inputs = requests[-1]["inputs"]
+            return httpx.Response(200, json=[[len(text)] for text in inputs])
+
+        embed_model = TEIEmbedding(base_url="http://tei")
+        # pylint: disable=protected-access
+        embed_model._client = httpx.Client(
+            base_url="http://tei", transport=httpx.MockTransport(handler)
+        )
+
+        self.assertEqual(
+            embed_model.get_text_embedding_batch(["a", "bb"]), [[1], [2]]
+        )
+        self.assertEqual(
+            requests,
+            [{"inputs": ["a", "bb"], "normalize": True, "truncate": True}],
+        )
+
+
+class TestCreateEmbedModel(unittest.TestCase):
+    """Test case for create_embed_model function."""
+
+    def test_backends(self):
+        """Test that the model name selects the backend."""
+        ollama_model = create_embed_model("all-minilm:l6-v2")
+        self.assertIsInstance(ollama_model, BatchOllamaEmbedding)
+        self.assertEqual(ollama_model.model_name, "all-minilm:l6-v2")
+        self.assertEqual(
+            embed_model_id(ollama_model), "ollama://all-minilm:l6-v2"
+        )
+        self.assertIsInstance(
+            create_embed_model("ollama://all-minilm:l6-v2"),
+            BatchOllamaEmbedding,
+        )
+
+        info = {
+            "model_id": "BAAI/bge-small-en-v1.5",
+            "max_client_batch_size": 32,
+        }
+        with patch(
+            "curia.rag.embeddings.httpx.get",
+            return_value=httpx.Response(
+                200, json=info, request=httpx.Request("GET", "http://tei")
+            ),
+        ) as get:
+            tei_model = create_embed_model("tei://localhost:8080")
+        get.assert_called_once()
+        self.assertEqual(get.call_args.args, ("http://localhost:8080/info",))
+        self.assertIsInstance(tei_model, TEIEmbedding)
+        self.assertEqual(tei_model.base_url, "http://localhost:8080")
+        self.assertEqual(tei_model.model_name, "BAAI/bge-small-en-v1.5")
+        self.assertEqual(tei_model.embed_batch_size, 32)
+        self.assertEqual(
+            embed_model_id(tei_model), "tei://BAAI/bge-small-en-v1.5"
+        )
+
+        # Only the model download and ONNX session are skipped.
+        with patch.object(
+            OnnxTextEmbedding, "download_model", return_value="model_dir"
+        ), patch.object(OnnxTextEmbedding, "load_onnx_model"):
+            fastembed_model = create_embed_model(
+                "fastembed://sentence-transformers/all-MiniLM-L6-v2",
+                32,
+                cache_dir="models",
+            )
+        self.assertIsInstance(fastembed_model, FastEmbedEmbedding)
+        self.assertEqual(
+            fastembed_model.model_name,
+            "sentence-transformers/all-MiniLM-L6-v2",
+        )
+        self.assertEqual(fastembed_model.embed_batch_size, 32)
+        self.assertEqual(fastembed_model.cache_dir, "models")
+
+        with self.assertRaises(ValueError):
+            create_embed_model("unknown://model")
+
+
+class TestGetQueryEmbeddingBatch(unittest.TestCase):
+    """Test case for get_query_embedding_batch function."""
+
+    def test_fastembed_query_encoding(self):
+        """Test that FastEmbed queries use the query encoding."""
+        with patch(
+            "llama_index.embeddings.fastembed.base.TextEmbedding"
+        ) as text_embedding:
+            embed_model = FastEmbedEmbedding(model_name="dummy")
+        text_embedding.return_value.query_embed.return_value = iter(
+            [np.array([1.0, 0.0]), np.array([0.0, 1.0])]
+        )
+
+        self.assertEqual(
+            get_query_embedding_batch(embed_model, ["a", "b"]),
+            [[1.0, 0.0], [0.0, 1.0]],
+        )
+        text_embedding.return_value.query_embed.assert_called_once_with(
+            ["a", "b"]
+        )
+        text_embedding.return_value.embed.assert_not_called()
+
+    def test_ollama_single_request(self):
+        """Test that Ollama queries are embedded in one request."""
+        embed_model = BatchOllamaEmbedding(model_name="dummy")
+        with patch.object(
+            BatchOllamaEmbedding,
+            "get_general_text_embeddings",
+            side_effect=lambda texts: [[float(text)] for text in texts],
+        ) as embed:
+            embeddings = get_query_embedding_batch(embed_model, ["1", "2"])
+
+        self.assertEqual(embeddings, [[1.0], [2.0]])
+        embed.assert_called_once_with(["1", "2"])
@@ -0,0 +1,27 @@
+"""Test module for language model selection."""
+
+import unittest
+
+from llama_index.llms.ollama import Ollama
+from llama_index.llms.openai_like import OpenAILike
+
+from curia.rag.llms import create_llm
+
+
+class TestCreateLLM(unittest.TestCase):
+    """Test case for create_llm function."""
+
+    def test_backends(self):
+        """Test that the model name selects the backend."""
+        ollama_llm = create_llm("initium/law_model")
+        self.assertIsInstance(ollama_llm, Ollama)
+        self.assertEqual(ollama_llm.model, "initium/law_model")
+        self.assertIsInstance(create_llm("ollama://gemma3:1b"), Ollama)
+
+        vllm_llm = create_llm("vllm://localhost:8000/org/law-model-awq")
+        self.assertIsInstance(vllm_llm, OpenAILike)
+        self.assertEqual(vllm_llm.model, "org/law-model-awq")
+        self.assertEqual(vllm_llm.api_base, "http://localhost:8000/v1")
+
+        with self.assertRaises(ValueError):
+            create_llm("unknown://model")
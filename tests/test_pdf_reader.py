@@ -0,0 +1,57 @@
+"""Test module for PDFReader functionality."""
+
+# pylint: disable=consider-using-with
+
+import os
+import tempfile
+import unittest
+
+from reportlab.pdfgen import canvas
+
+from curia.rag import PDFReader
+from curia.rag.pdf_reader import load_file
+
+
+class TestPDFReader(unittest.TestCase):
+    """Test case for PDFReader class."""
+
+    def setUp(self):
+        """Create a PDF with two text pages around a blank one."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pdf_path = os.path.join(self.temp_dir.name, "test.pdf")
+
+        canv = canvas.Canvas(self.pdf_path)
+        canv.drawString(50, 700, "first line")
+        canv.drawString(50, 680, "second line")
+        canv.showPage()
+        canv.showPage()
+        canv.drawString(50, 700, "last page")
+        canv.save()
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def test_load_data(self):
+        """Test that pages are flattened and blank pages skipped."""
+        documents = PDFReader().load_data(
+            self.pdf_path, extra_info={"file_path": self.pdf_path}
+        )
+
+        self.assertEqual(
+            [document.text for document in documents],
+            ["first line second line", "last page"],
+        )
+        self.assertEqual(
+            [document.metadata["page_label"] for document in documents],
+            ["1", "3"],
+        )
+        self.assertEqual(documents[0].metadata["file_name"], "test.pdf")
+        self.assertEqual(documents[0].metadata["file_path"], self.pdf_path)
+
+    def test_load_file(self):
+        """Test that a single file is loaded with its file metadata."""
+        documents = load_file(self.pdf_path)
+
+        self.assertEqual(len(documents), 2)
+        self.assertEqual(documents[0].metadata["file_path"], self.pdf_path)
@@ -0,0 +1,63 @@
+"""Test module for QueryCache functionality."""
+
+import unittest
+from unittest.mock import patch
+
+from curia.frontend.query_cache import QueryCache
+
+
+class TestQueryCache(unittest.TestCase):
+    """Test case for QueryCache class."""
+
+    def test_key_normalization(self):
+        """Test that case and whitespace differences share an entry."""
+        cache = QueryCache()
+        cache.set("  What is\tthe RULING? ", "answer")
+
+        self.assertEqual(cache.get("what is the ruling?"), "answer")
+        self.assertIsNone(cache.get("what is the ruling"))
+
+    def test_expiry(self):
+        """Test that responses expire after the time-to-live."""
+        cache = QueryCache(ttl=10.0)
+        with patch(
+            "curia.frontend.query_cache.time.monotonic", return_value=100.0
+        ):
+            cache.set("question", "answer")
+        with patch(
+            "curia.frontend.query_cache.time.monotonic", return_value=110.0
+        ):
+            self.assertEqual(cache.get("question"), "answer")
+        with patch(
+            "curia.frontend.query_cache.time.monotonic", return_value=110.5
+        ):
+            self.assertIsNone(cache.get("question"))
+            cache.set("question", "new answer")
+            self.assertEqual(cache.get("question"), "new answer")
+
+    def test_eviction_order(self):
+        """Test that the least recently used response is evicted."""
+        cache = QueryCache(maxsize=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "1")
+        self.assertEqual(cache.get("c"), "3")
+
+    def test_empty_response(self):
+        """Test that empty responses are not cached."""
+        cache = QueryCache()
+        cache.set("question", "")
+
+        self.assertIsNone(cache.get("question"))
+
+    def test_clear(self):
+        """Test that clearing drops all responses."""
+        cache = QueryCache()
+        cache.set("question", "answer")
+        cache.clear()
+
+        self.assertIsNone(cache.get("question"))
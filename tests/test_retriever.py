@@ -0,0 +1,68 @@
+"""Test module for BatchingRetriever functionality."""
+
+import threading
+import unittest
+
+from llama_index.core.schema import NodeWithScore, TextNode
+
+from curia.rag.retriever import BatchingRetriever
+
+
+class TestBatchingRetriever(unittest.TestCase):
+    """Test case for BatchingRetriever class."""
+
+    def test_concurrent_queries_are_batched(self):
+        """Test that concurrent queries are retrieved in one call."""
+        batches = []
+
+        def retrieve_batch(queries):
+            batches.append(queries)
+            return [[NodeWithScore(node=TextNode(text=q))] for q in queries]
+
+        retriever = BatchingRetriever(retrieve_batch, batch_window=0.5)
+        results = {}
+
+        def retrieve(query):
+            results[query] = retriever.retrieve(query)[0].node.text
+
+        threads = [
+            threading.Thread(target=retrieve, args=(str(number),))
+            for number in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(sorted(batches[0]), ["0", "1", "2", "3"])
+        self.assertEqual(results, {query: query for query in "0123"})
+
+    def test_max_batch_size(self):
+        """Test that batches are capped at the maximum batch size."""
+        batches = []
+
+        def retrieve_batch(queries):
+            batches.append(len(queries))
+            return [[] for _ in queries]
+
+        retriever = BatchingRetriever(
+            retrieve_batch, batch_window=0.5, max_batch_size=2
+        )
+        threads = [
+            threading.Thread(target=retriever.retrieve, args=("query",))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(batches), [1, 2])
+
+    def test_errors_are_raised(self):
+        """Test that a failed batch raises in every waiting caller."""
+        retriever = BatchingRetriever(lambda queries: 1 / 0, batch_window=0.0)
+
+        with self.assertRaises(ZeroDivisionError):
+            retriever.retrieve("query")
@@ -0,0 +1,38 @@
+"""Test module for WordSplitter functionality."""
+
+import unittest
+
+from curia.rag.text_splitter import WordSplitter
+
+
+class TestWordSplitter(unittest.TestCase):
+    """Test case for WordSplitter class."""
+
+    def test_split_text(self):
+        """Test that chunks are overlapping word windows of the text."""
+        splitter = WordSplitter(chunk_size=4, chunk_overlap=1)
+        text = "a  b c\td e f g h i j"
+
+        self.assertEqual(
+            splitter.split_text(text),
+            ["a  b c\td", "d e f g", "g h i j"],
+        )
+
+    def test_split_text_tail(self):
+        """Test that the final words are kept in the last chunk."""
+        splitter = WordSplitter(chunk_size=4, chunk_overlap=2)
+
+        self.assertEqual(
+            splitter.split_text("a b c d e f g"),
+            ["a b c d", "c d e f", "e f g"],
+        )
+        self.assertEqual(splitter.split_text("a"), ["a"])
+
+    def test_invalid_overlap(self):
+        """Test that an overlap as large as the chunk size is rejected."""
+        with self.assertRaises(ValueError):
+            WordSplitter(chunk_size=4, chunk_overlap=4)
+
+    def test_split_text_empty(self):
+        """Test that text without words produces no chunks."""
+        self.assertEqual(WordSplitter().split_text(" \n "), [])
@@ -3,14 +3,20 @@
 # pylint: disable=consider-using-with
 
 import io
+import json
 import logging
 import os
 import tempfile
+import threading
 import unittest
 from unittest.mock import patch
 
+import chromadb
+import numpy as np
 import yaml
 from llama_index.core.base.llms.types import ChatResponse
+from llama_index.core.schema import NodeRelationship
+from llama_index.vector_stores.chroma import ChromaVectorStore
 from reportlab.pdfgen import canvas
 
 from curia.rag import VectorStore
@@ -45,7 +51,11 @@ class TestVectorStore(unittest.TestCase):
                 "db_path": databases_dir,
                 "collection_name": "temp_docs",
             },
-            "models": {"embed_model_name": "dummy", "llm_name": "dummy"},
+            "models": {
+                "embed_model_name": "dummy",
+                "llm_name": "dummy",
+                "warm_up": False,
+            },
         }
 
         # Write the content to the temporary config.yaml file
@@ -58,6 +68,7 @@ class TestVectorStore(unittest.TestCase):
 
         self._dummy_models()
 
+        self.config_path = config_path
         self.vector_store_new = VectorStore(config_path, restart_database=True)
         self.vector_store_repeat = VectorStore(
             config_path, restart_database=False
@@ -72,14 +83,17 @@ class TestVectorStore(unittest.TestCase):
         patch(
             ".".join(
                 [
-                    "curia.rag.vector_store.OllamaEmbedding",
-                    "get_general_text_embedding",
+                    "curia.rag.embeddings.BatchOllamaEmbedding",
+                    "get_general_text_embeddings",
                 ]
             ),
-            side_effect=lambda text: [int(text[-1])],
+            side_effect=lambda texts: [
+                [1, int(text[-1]) if text[-1].isdigit() else 0]
+                for text in texts
+            ],
         ).start()
         patch(
-            "curia.rag.vector_store.Ollama.chat",
+            "curia.rag.llms.Ollama.chat",
             side_effect=lambda x: ChatResponse(message=x[1]),
         ).start()
 
@@ -113,6 +127,307 @@ class TestVectorStore(unittest.TestCase):
                 self.vector_store_repeat.retrieve(text)[0].node.text, text
             )
 
+    def test_retrieve_batch(self):
+        """Test the retrieve_batch method of VectorStore."""
+        queries = ["0", "1", "2"]
+        for vector_store in [self.vector_store_new, self.vector_store_repeat]:
+            results = vector_store.retrieve_batch(queries)
+            self.assertEqual(
+                [nodes[0].node.text for nodes in results], queries
+            )
+            self.assertEqual(
+                [nodes[0].node.node_id for nodes in results],
+                [
+                    vector_store.retrieve(query)[0].node.node_id
+                    for query in queries
+                ],
+            )
+
+    def test_updated_file(self):
+        """Test that re-indexing a modified file replaces its chunks."""
+        self._create_sample_pdf("2", "test.pdf")
+        pdf_path = os.path.join(self.temp_dir.name, "raw", "test.pdf")
+        mtime = os.path.getmtime(pdf_path) + 10
+        os.utime(pdf_path, (mtime, mtime))
+
+        vector_store = VectorStore(self.config_path, restart_database=False)
+        self.assertEqual(
+            vector_store.collection.get(where={"file_name": "test.pdf"})[
+                "documents"
+            ],
+            ["2"],
+        )
+
+    def test_touched_file(self):
+        """Test that a file with unchanged content is not re-embedded."""
+        pdf_path = os.path.join(self.temp_dir.name, "raw", "test.pdf")
+        mtime = os.path.getmtime(pdf_path) + 10
+        os.utime(pdf_path, (mtime, mtime))
+
+        with patch(
+            "curia.rag.embeddings.BatchOllamaEmbedding"
+            ".get_general_text_embeddings"
+        ) as embed:
+            vector_store = VectorStore(self.config_path)
+        embed.assert_not_called()
+
+        record_path = os.path.join(
+            self.temp_dir.name, "databases", "processed.json"
+        )
+        with open(record_path, "r", encoding="utf-8") as record_file:
+            self.assertEqual(
+                json.load(record_file)["test.pdf"]["mtime"], mtime
+            )
+        self.assertEqual(vector_store.retrieve("0")[0].node.text, "0")
+
+    def test_legacy_record(self):
+        """Test that records holding only modification times are migrated."""
+        record_path = os.path.join(
+            self.temp_dir.name, "databases", "processed.json"
+        )
+        raw_dir = os.path.join(self.temp_dir.name, "raw")
+        with open(record_path, "w", encoding="utf-8") as record_file:
+            json.dump(
+                {
+                    file: os.path.getmtime(os.path.join(raw_dir, file))
+                    for file in os.listdir(raw_dir)
+                },
+                record_file,
+            )
+
+        with patch(
+            "curia.rag.embeddings.BatchOllamaEmbedding"
+            ".get_general_text_embeddings"
+        ) as embed:
+            VectorStore(self.config_path)
+        embed.assert_not_called()
+
+        with open(record_path, "r", encoding="utf-8") as record_file:
+            self.assertIn("sha256", json.load(record_file)["test.pdf"])
+
+    def test_embed_model_change(self):
+        """Test that collections of another embedding model are re-indexed."""
+        client = chromadb.PersistentClient(
+            path=os.path.join(self.temp_dir.name, "databases")
+        )
+        client.delete_collection("temp_docs")
+        client.create_collection("temp_docs").add(
+            ids=["stale"], documents=["stale"], embeddings=[[1, 9]]
+        )
+
+        vector_store = VectorStore(self.config_path)
+        self.assertEqual(
+            vector_store.collection.metadata["embed_model"], "ollama://dummy"
+        )
+        self.assertEqual(
+            sorted(vector_store.collection.get()["documents"]),
+            ["0", "1", "2"],
+        )
+
+    def test_embed_backend_change(self):
+        """Test that switching to FastEmbed re-embeds existing files."""
+        with patch(
+            "llama_index.embeddings.fastembed.base.TextEmbedding"
+        ) as text_embedding:
+            text_embedding.return_value.embed.side_effect = lambda texts: [
+                np.array([1.0, float(text[-1])]) for text in texts
+            ]
+            vector_store = VectorStore(
+                self.config_path, embed_model_name="fastembed://dummy"
+            )
+
+        self.assertEqual(
+            vector_store.collection.metadata["embed_model"],
+            "fastembed://dummy",
+        )
+        self.assertEqual(vector_store.collection.count(), 3)
+        self.assertEqual(text_embedding.return_value.embed.call_count, 1)
+
+    def test_restart_applies_space(self):
+        """Test that restarting recreates a collection in cosine space."""
+        client = chromadb.PersistentClient(
+            path=os.path.join(self.temp_dir.name, "databases")
+        )
+        client.delete_collection("temp_docs")
+        client.create_collection(
+            "temp_docs",
+            metadata={"embed_model": "ollama://dummy", "hnsw:space": "l2"},
+        )
+
+        with self.assertLogs("VectorStore", level="WARNING"):
+            vector_store = VectorStore(self.config_path)
+        self.assertEqual(vector_store.collection.metadata["hnsw:space"], "l2")
+
+        vector_store = VectorStore(self.config_path, restart_database=True)
+        self.assertEqual(
+            vector_store.collection.metadata["hnsw:space"], "cosine"
+        )
+        self.assertEqual(vector_store.retrieve("1")[0].node.text, "1")
+
+    def test_hnsw_settings(self):
+        """Test that HNSW settings are applied when the database restarts."""
+        self.assertEqual(
+            self.vector_store_repeat.collection.metadata,
+            {
+                "embed_model": "ollama://dummy",
+                "hnsw:space": "cosine",
+                "hnsw:construction_ef": 200,
+                "hnsw:M": 32,
+                "hnsw:search_ef": 64,
+            },
+        )
+
+        with self.assertLogs("VectorStore", level="WARNING"):
+            vector_store = VectorStore(self.config_path, hnsw={"M": 16})
+        self.assertEqual(vector_store.collection.metadata["hnsw:M"], 32)
+
+        vector_store = VectorStore(
+            self.config_path, restart_database=True, hnsw={"M": 16}
+        )
+        self.assertEqual(vector_store.collection.metadata["hnsw:M"], 16)
+        self.assertEqual(
+            vector_store.collection.metadata["hnsw:space"], "cosine"
+        )
+
+    def test_warm_up(self):
+        """Test that failed model warm-ups do not prevent startup."""
+        with patch(
+            "curia.rag.vector_store.warm_up_llm", side_effect=ConnectionError
+        ) as warm_up_llm, self.assertLogs("VectorStore") as logs:
+            vector_store = VectorStore(self.config_path, warm_up=True)
+
+        warm_up_llm.assert_called_once()
+        self.assertIn("INFO:VectorStore:Model dummy warmed up", logs.output)
+        self.assertIn(
+            "WARNING:VectorStore:Model dummy warm-up failed: ", logs.output
+        )
+        self.assertEqual(vector_store.retrieve("0")[0].node.text, "0")
+
+    def test_db_server(self):
+        """Test that a configured database host selects a Chroma server."""
+        client = chromadb.PersistentClient(
+            path=os.path.join(self.temp_dir.name, "server")
+        )
+        with patch(
+            "curia.rag.vector_store.chromadb.HttpClient", return_value=client
+        ) as http_client:
+            vector_store = VectorStore(
+                self.config_path,
+                restart_database=True,
+                db_host="localhost",
+                db_port=8001,
+            )
+
+        http_client.assert_called_once_with(host="localhost", port=8001)
+        self.assertEqual(vector_store.retrieve("1")[0].node.text, "1")
+
+    def test_switch_to_db_server(self):
+        """Test that moving a local database to a new server re-indexes."""
+        client = chromadb.PersistentClient(
+            path=os.path.join(self.temp_dir.name, "server")
+        )
+        with patch(
+            "curia.rag.vector_store.chromadb.HttpClient", return_value=client
+        ):
+            vector_store = VectorStore(self.config_path, db_host="localhost")
+
+        self.assertEqual(vector_store.collection.count(), 3)
+        self.assertEqual(vector_store.retrieve("1")[0].node.text, "1")
+
+    def test_streamed_ingestion(self):
+        """Test ingestion with parallel parsing and small batches."""
+        vector_store = VectorStore(
+            self.config_path,
+            restart_database=True,
+            num_workers=2,
+            ingest_batch_size=1,
+        )
+        for text in ["0", "1", "2"]:
+            self.assertEqual(vector_store.retrieve(text)[0].node.text, text)
+
+    def test_pipelined_ingestion(self):
+        """Test that a batch is embedded while the previous one is written."""
+        pdf_path = os.path.join(self.temp_dir.name, "raw", "pages.pdf")
+        canv = canvas.Canvas(pdf_path)
+        for page in range(300):
+            canv.drawString(50, 700, f"page {page}")
+            canv.showPage()
+        canv.save()
+
+        writing, overlapped = threading.Event(), threading.Event()
+        embedded, written = [], []
+        add = ChromaVectorStore.add
+
+        def embed(texts):
+            # Chunks beyond the first default batch of 256 belong to a
+            # later batch, whose embedding should overlap the first write.
+            if sum(embedded) >= 256 and writing.wait(timeout=5):
+                overlapped.set()
+            embedded.append(len(texts))
+            return [[1, int(text[-1])] for text in texts]
+
+        def write(vector_store, nodes, **add_kwargs):
+            writing.set()
+            if not written:
+                overlapped.wait(timeout=5)
+            writing.clear()
+            written.append(len(nodes))
+            return add(vector_store, nodes, **add_kwargs)
+
+        with patch(
+            "curia.rag.embeddings.BatchOllamaEmbedding"
+            ".get_general_text_embeddings",
+            side_effect=embed,
+        ), patch("curia.rag.vector_store.ChromaVectorStore.add", new=write):
+            vector_store = VectorStore(self.config_path, restart_database=True)
+
+        self.assertTrue(overlapped.is_set())
+        self.assertEqual(written, [256, 47])
+        self.assertEqual(vector_store.collection.count(), 303)
+
+    def test_repeated_chunks(self):
+        """Test that chunks repeated across batches are written once."""
+        self._create_sample_pdf("5 7 5 7 5 7", "repeated.pdf")
+        written = []
+        add = ChromaVectorStore.add
+
+        def write(vector_store, nodes, **add_kwargs):
+            written.extend(node.node_id for node in nodes)
+            return add(vector_store, nodes, **add_kwargs)
+
+        with patch("curia.rag.vector_store.ChromaVectorStore.add", new=write):
+            vector_store = VectorStore(
+                self.config_path,
+                restart_database=True,
+                chunk_size=2,
+                chunk_overlap=0,
+                ingest_batch_size=1,
+            )
+
+        self.assertEqual(len(written), len(set(written)))
+        self.assertEqual(
+            sorted(vector_store.collection.get()["documents"]),
+            ["0", "1", "2", "5 7"],
+        )
+
+    def test_chunk_relationships(self):
+        """Test that stored chunks only refer to existing nodes."""
+        self._create_sample_pdf("5 7 9", "chunks.pdf")
+        vector_store = VectorStore(
+            self.config_path,
+            restart_database=True,
+            chunk_size=1,
+            chunk_overlap=0,
+        )
+
+        stored = vector_store.collection.get()
+        for metadata in stored["metadatas"]:
+            relationships = json.loads(metadata["_node_content"])[
+                "relationships"
+            ]
+            self.assertNotIn(NodeRelationship.PREVIOUS.value, relationships)
+            self.assertNotIn(NodeRelationship.NEXT.value, relationships)
+
     def test_query(self):
         """Test the query method of VectorStore."""
         for text in ["0", "1", "2"]: